@@ -1,103 +1,297 @@
+import contextlib
+import functools
+import hashlib
 import json
+import mmap
+import os
+import pickle
 import re
+import tempfile
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
+# msgspec is optional, it parses JSON much faster than the standard library when it is
+# installed. Both accept bytes so files can be read without decoding them first, but
+# only msgspec can read from a memory mapped file. orjson is not used because it loads
+# integers larger than 64 bits as floats, which would change the generated types.
+# _buffer_loads is only set when the loader can read from a memory mapped file.
+_json_loads: Callable[[bytes], Any]
+_buffer_loads: Callable[[memoryview], Any] | None
+try:
+    from msgspec.json import decode as _msgspec_loads
+except ImportError:
+    _json_loads = json.loads
+    _buffer_loads = None
+else:
+    _json_loads = _buffer_loads = _msgspec_loads
+
+_SNAKE_RE = re.compile(r"([a-z0-9])([A-Z])")
+
+# Upper limit on the threads used to read input files.
+_MAX_READ_WORKERS = 32
+
+# Upper limit on the files read ahead of the file being parsed, so a large folder is not
+# held in memory all at once.
+_MAX_READ_AHEAD = _MAX_READ_WORKERS * 2
+
+# Files larger than this are memory mapped instead of being copied into memory, if the
+# JSON loader can read from a memory mapped file.
+_MMAP_THRESHOLD = 16 * 1024 * 1024
+
+# Must be changed whenever TypeInfo changes so old caches are not loaded.
+_CACHE_VERSION = 6
 
+# Cache version, and the resolved path, modification time (ns), size, and root name of
+# the file a cached TypeInfo came from.
+_CacheKey = tuple[int, str, int, int, str]
+
+
+@functools.lru_cache(maxsize=8192)
 def to_snake_case(text: str) -> str:
     """Convert a string to snake_case."""
-    text = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", text)
-    return text.lower()
+    return _SNAKE_RE.sub(r"\1_\2", text).lower()
 
 
+@functools.lru_cache(maxsize=8192)
 def to_pascal_case(text: str) -> str:
     """Convert a string to PascalCase."""
     return "".join(part[0].upper() + part[1:] for part in text.split("_") if part)
 
 
-class TypeInfo(BaseModel):
-    name: str = Field(default="")
-    allow_str: bool = Field(default=False)
-    allow_int: bool = Field(default=False)
-    allow_float: bool = Field(default=False)
-    allow_none: bool = Field(default=False)
-    allow_dict: bool = Field(default=False)
-    allow_list: bool = Field(default=False)
-    optional: bool = Field(default=False)
-    list_items: "TypeInfo | None" = Field(default=None)
-    dict_keys: dict[str, "TypeInfo"] = Field(default_factory=dict)
+# Bit flags stored in TypeInfo.flags, one per type observed for a value.
+STR = 1 << 0
+INT = 1 << 1
+FLOAT = 1 << 2
+NONE = 1 << 3
+DICT = 1 << 4
+LIST = 1 << 5
+OPTIONAL = 1 << 6
+
+
+# The keys and value types of a dictionary that only contains scalars.
+_Shape = tuple[tuple[str, ...], tuple[type, ...]]
+
+# Upper limit on the shapes remembered for the items of a list, after this many shapes
+# the items are too varied for remembering them to be worth it.
+_MAX_SEEN_SHAPES = 64
+
+# Number of dictionaries that can not be skipped (because they contain containers) that
+# can be parsed into the items of a list before shapes stop being tracked for it.
+_MAX_SHAPE_MISSES = 8
+
+
+@dataclass(slots=True)
+class TypeInfo:
+    name: str = ""
+    flags: int = 0
+    list_items: "TypeInfo | None" = None
+    dict_keys: dict[str, "TypeInfo"] = field(default_factory=dict)
+    # Shapes of the scalar only dictionaries already parsed into this TypeInfo, parsing
+    # another dictionary with the same shape would not change anything. None once
+    # tracking shapes has stopped paying off.
+    seen_shapes: set[_Shape] | None = field(
+        default_factory=set,
+        repr=False,
+        compare=False,
+    )
+    shape_misses: int = field(default=0, repr=False, compare=False)
 
 
 parsable_types = (
     str | int | float | None | dict[str, "parsable_types"] | list["parsable_types"]
 )
 
+# Flag to set for each scalar type, looked up by exact type.
+_SCALAR_FLAGS: dict[type, int] = {
+    str: STR,
+    int: INT,
+    float: FLOAT,
+    type(None): NONE,
+}
+_SCALAR_TYPES = frozenset(_SCALAR_FLAGS)
 
-def _parse_value(
-    value: parsable_types,
-    target_type: TypeInfo,
-    key_name: str = "",
-) -> None:
-    """Parse a single value and update the target TypeInfo."""
-    if isinstance(value, str):
-        target_type.allow_str = True
-    elif isinstance(value, int):
-        target_type.allow_int = True
-    elif isinstance(value, float):
-        target_type.allow_float = True
-    elif value is None:
-        target_type.allow_none = True
-    elif isinstance(value, dict):
-        target_type.allow_dict = True
-        parse_dict(value, target_type)
-    # List elif isn't strictly required as long as the input has the correct type, but
-    # there is no way to guarantee the input actually matches the type.
-    elif isinstance(value, list):  # type: ignore[reportUnnecessaryIsInstance]
-        target_type.allow_list = True
-        if target_type.list_items is None:
-            target_type.list_items = TypeInfo(
-                name=f"{key_name}_item" if key_name else f"{target_type.name}Item",
-            )
-        for x in value:
-            _parse_value(x, target_type.list_items)
-    else:
-        msg = f"Unexpected list item type: {type(x)}"
-        raise TypeError(msg)
 
+# A value to parse, the TypeInfo it updates, and the key it was found under.
+_WorkItem = tuple[parsable_types, TypeInfo, str]
 
-def parse_dict(input_data: dict[str, Any], type_info: TypeInfo) -> TypeInfo:
-    """Parse dictionary data into TypeInfo."""
+
+def _has_seen_dict(type_info: TypeInfo) -> bool:
+    """Check if any dictionary has been parsed into a TypeInfo."""
+    return bool(type_info.flags & DICT or type_info.dict_keys)
+
+
+def _push_dict(
+    input_data: dict[str, Any],
+    type_info: TypeInfo,
+    stack: list[_WorkItem],
+) -> None:
+    """Add the keys of a dictionary to a TypeInfo and queue their values."""
+    # New keys are optional if they were missing from a previously parsed dictionary.
+    new_key_flags = OPTIONAL if _has_seen_dict(type_info) else 0
+    dict_keys = type_info.dict_keys
+    items: list[_WorkItem] = []
     for key, value in input_data.items():
-        if key not in type_info.dict_keys:
-            type_info.dict_keys[key] = TypeInfo(
+        key_type = dict_keys.get(key)
+        if key_type is None:
+            key_type = TypeInfo(
                 name=f"{type_info.name}{to_pascal_case(key)}",
+                flags=new_key_flags,
             )
+            dict_keys[key] = key_type
+
+        # Scalars are handled immediately, only values that need more parsing are put
+        # on the stack.
+        scalar_flag = _SCALAR_FLAGS.get(type(value))
+        if scalar_flag is not None:
+            key_type.flags |= scalar_flag
+        else:
+            items.append((value, key_type, key))
+
+    # Mark missing keys as optional, every key in input_data is in dict_keys by now so
+    # there can only be missing keys if the sizes differ.
+    if len(dict_keys) != len(input_data):
+        for key in dict_keys.keys() - input_data.keys():
+            dict_keys[key].flags |= OPTIONAL
+
+    # Reversed so values are popped, and parsed, in their original order.
+    stack.extend(reversed(items))
+
+
+def _push_list(
+    input_data: list[Any],
+    type_info: TypeInfo,
+    key_name: str,
+    stack: list[_WorkItem],
+) -> None:
+    """Queue the items of a list to be parsed into the list_items of a TypeInfo."""
+    if type_info.list_items is None:
+        type_info.list_items = TypeInfo(
+            name=f"{key_name}_item" if key_name else f"{type_info.name}Item",
+        )
+
+    list_items = type_info.list_items
+
+    # Lists usually hold a single type, collecting the types first means lists of only
+    # scalars are never looped over in Python.
+    has_non_scalars = False
+    for value_type in set(map(type, input_data)):
+        scalar_flag = _SCALAR_FLAGS.get(value_type)
+        if scalar_flag is None:
+            has_non_scalars = True
+        else:
+            list_items.flags |= scalar_flag
+
+    if not has_non_scalars:
+        return
+
+    seen_shapes = list_items.seen_shapes
+    if seen_shapes is None:
+        stack.extend(
+            (x, list_items, "")
+            for x in reversed(input_data)
+            if type(x) not in _SCALAR_FLAGS
+        )
+    else:
+        _push_unseen_items(input_data, list_items, seen_shapes, stack)
 
-        _parse_value(value, type_info.dict_keys[key], key)
 
-    # Mark missing keys as optional
-    for key in type_info.dict_keys:
-        if key not in input_data:
-            type_info.dict_keys[key].optional = True
+def _push_unseen_items(
+    input_data: list[Any],
+    list_items: TypeInfo,
+    seen_shapes: set[_Shape],
+    stack: list[_WorkItem],
+) -> None:
+    """Queue the items of a list that are not dictionaries of an already seen shape."""
+    # Lists of records often repeat the same dictionary shape many times, those
+    # dictionaries are skipped instead of being parsed again. Only dictionaries of
+    # scalars can be skipped, ones containing containers can add nested information.
+    is_scalar_types = _SCALAR_TYPES.issuperset
+    tracking = True
+    items: list[_WorkItem] = []
+    for x in input_data:
+        value_type = type(x)
+        if value_type in _SCALAR_FLAGS:
+            continue
+        if value_type is dict and tracking:
+            value_types = tuple(map(type, x.values()))
+            if is_scalar_types(value_types):
+                shape = (tuple(x), value_types)
+                if shape in seen_shapes:
+                    continue
+                seen_shapes.add(shape)
+                tracking = len(seen_shapes) < _MAX_SEEN_SHAPES
+            else:
+                list_items.shape_misses += 1
+                tracking = list_items.shape_misses < _MAX_SHAPE_MISSES
+            if not tracking:
+                list_items.seen_shapes = None
+        items.append((x, list_items, ""))
+
+    # Reversed so items are popped, and parsed, in their original order.
+    stack.extend(reversed(items))
+
+
+def _parse_iter(stack: list[_WorkItem]) -> None:
+    """Parse queued values until the stack is empty.
+
+    An explicit stack is used instead of recursion so deeply nested data does not hit
+    the recursion limit.
+    """
+    while stack:
+        value, target_type, key_name = stack.pop()
+        scalar_flag = _SCALAR_FLAGS.get(type(value))
+        if scalar_flag is not None:
+            target_type.flags |= scalar_flag
+        # Subclasses of the scalar types (ex. bool) miss the exact type lookup.
+        elif isinstance(value, str):
+            target_type.flags |= STR
+        elif isinstance(value, int):
+            target_type.flags |= INT
+        elif isinstance(value, float):
+            target_type.flags |= FLOAT
+        elif isinstance(value, dict):
+            _push_dict(value, target_type, stack)
+            target_type.flags |= DICT
+        # List elif isn't strictly required as long as the input has the correct type,
+        # but there is no way to guarantee the input actually matches the type.
+        elif isinstance(value, list):  # type: ignore[reportUnnecessaryIsInstance]
+            target_type.flags |= LIST
+            _push_list(value, target_type, key_name, stack)
+        else:
+            msg = f"Unexpected value type: {type(value)}"
+            raise TypeError(msg)
 
+
+def parse_dict(input_data: dict[str, Any], type_info: TypeInfo) -> TypeInfo:
+    """Parse dictionary data into TypeInfo."""
+    stack: list[_WorkItem] = []
+    _push_dict(input_data, type_info, stack)
+    type_info.flags |= DICT
+    _parse_iter(stack)
     return type_info
 
 
 def parse_list(input_data: list[Any], type_info: TypeInfo) -> TypeInfo:
     """Parse list data into TypeInfo."""
     if not input_data:  # Empty list
-        type_info.allow_list = True
+        type_info.flags |= LIST
         return type_info
 
-    if type_info.list_items is None:
-        type_info.list_items = TypeInfo(name=f"{type_info.name}Item")
-
-    for item in input_data:
-        _parse_value(item, type_info.list_items)
-
+    stack: list[_WorkItem] = []
+    _push_list(input_data, type_info, "", stack)
+    _parse_iter(stack)
     return type_info
 
 
@@ -114,62 +308,186 @@ def parse(input_data: dict[str, Any] | list[Any], type_info: TypeInfo) -> TypeIn
     raise TypeError(msg)
 
 
-# C901 - This isn't that complicated, it's only like 30 lines of code and all of it is
-# really simple if and string concatenation.
-def build_type_annotation(type_info: TypeInfo, models: list[str]) -> str:  # noqa: C901
+def merge_typeinfo(dst: TypeInfo, src: TypeInfo) -> None:
+    """Merge the types seen by src into dst.
+
+    The result is the same as if the data parsed into src had been parsed into dst.
+    TypeInfos from src are moved into dst rather than copied.
+    """
+    stack = [(dst, src)]
+    while stack:
+        dst_type, src_type = stack.pop()
+
+        # Keys are optional if any dictionary on either side was missing them.
+        if _has_seen_dict(src_type):
+            for key in dst_type.dict_keys.keys() - src_type.dict_keys.keys():
+                dst_type.dict_keys[key].flags |= OPTIONAL
+
+        dst_seen_dict = _has_seen_dict(dst_type)
+        for key, src_child in src_type.dict_keys.items():
+            dst_child = dst_type.dict_keys.get(key)
+            if dst_child is None:
+                if dst_seen_dict:
+                    src_child.flags |= OPTIONAL
+                dst_type.dict_keys[key] = src_child
+            else:
+                stack.append((dst_child, src_child))
+
+        if src_type.list_items is not None:
+            if dst_type.list_items is None:
+                dst_type.list_items = src_type.list_items
+            else:
+                stack.append((dst_type.list_items, src_type.list_items))
+
+        dst_type.flags |= src_type.flags
+
+
+# The scalar flags are the lowest bits so they can index _SCALAR_ANNOTATIONS.
+_SCALAR_MASK = STR | INT | FLOAT | NONE
+
+
+def _scalar_annotation(flags: int) -> str:
+    """Build the scalar part of a type annotation, with a leading separator."""
+    names = ((STR, "str"), (INT, "int"), (FLOAT, "float"), (NONE, "None"))
+    return "".join(f" | {name}" for flag, name in names if flags & flag)
+
+
+# The scalar part of a type annotation for every combination of scalar flags.
+_SCALAR_ANNOTATIONS = [_scalar_annotation(flags) for flags in range(_SCALAR_MASK + 1)]
+
+
+# The code parts being written, and what to do with them: append a str to them, append
+# the type annotation for a TypeInfo to them, or add them to the models when None.
+_CodeItem = tuple[list[str], str | TypeInfo | None]
+
+
+def build_type_annotation(type_info: TypeInfo, models: list[str]) -> str:
     """Build type annotation from a TypeInfo."""
-    type_parts: list[str] = []
+    out: list[str] = []
+    _write_code([(out, type_info)], models)
+    return "".join(out)
+
+
+def _write_code(stack: list[_CodeItem], models: list[str]) -> None:
+    """Write the code for the items on a stack until it is empty.
+
+    An explicit stack is used instead of recursion so deeply nested data does not
+    exceed Python's recursion limit. Nested annotations are written into the same list
+    so each part is only copied once when the list is finally joined.
+    """
+    while stack:
+        out, item = stack.pop()
+        if isinstance(item, str):
+            out.append(item)
+        elif item is None:
+            models.insert(0, "".join(out))
+        else:
+            _push_annotation(item, out, stack)
+
+
+def _has_nested_parts(type_info: TypeInfo) -> bool:
+    """Check if the type annotation for a TypeInfo has parts that must be queued."""
+    list_items = type_info.list_items
+    return bool(
+        type_info.dict_keys
+        or (list_items and (list_items.dict_keys or list_items.list_items)),
+    )
 
-    if type_info.allow_str:
-        type_parts.append("str")
-    if type_info.allow_int:
-        type_parts.append("int")
-    if type_info.allow_float:
-        type_parts.append("float")
-    if type_info.allow_none or type_info.optional:
-        type_parts.append("None")
 
+def _push_annotation(
+    type_info: TypeInfo,
+    out: list[str],
+    stack: list[_CodeItem],
+) -> None:
+    """Append the type annotation for a TypeInfo to out, queueing any nested parts."""
+    start = len(out)
+    flags = type_info.flags
+
+    # Every part is written with a leading separator, the first one is removed at the
+    # end.
+    scalar_flags = flags & _SCALAR_MASK
+    if flags & OPTIONAL:
+        scalar_flags |= NONE
+    if scalar_flags:
+        out.append(_SCALAR_ANNOTATIONS[scalar_flags])
+
+    dict_class_name = ""
     if type_info.dict_keys:
         dict_class_name = f"{to_pascal_case(type_info.name)}Dict"
-        type_parts.append(f'"{dict_class_name}"')
-        dict_model = generate_dict_model(type_info, dict_class_name, models)
-        models.insert(0, dict_model)
-    elif type_info.allow_dict:
-        type_parts.append("dict[str, Any]")
-
-    list_types: list[str] = []
-    if type_info.list_items:
-        list_type = build_type_annotation(type_info.list_items, models)
-        list_types.append(list_type)
-    elif type_info.allow_list:
-        list_types.append("Any")
-
-    if list_types:
-        type_parts.append(f"list[{' | '.join(list_types)}]")
+        out += (" | ", f'"{dict_class_name}"')
+    elif flags & DICT:
+        out += (" | ", "dict[str, Any]")
+
+    list_items = type_info.list_items
+    if list_items:
+        out += (" | ", "list[")
+        if _has_nested_parts(list_items):
+            stack += ((out, "]"), (out, list_items))
+        else:
+            _push_annotation(list_items, out, stack)
+            out.append("]")
+    elif flags & LIST:
+        out += (" | ", "list[Any]")
+
+    if len(out) == start:
+        out.append("Any")
+    else:
+        out[start] = out[start].removeprefix(" | ")
 
-    if len(type_parts) == 0:
-        return "Any"
-    if len(type_parts) == 1:
-        return type_parts[0]
-    return " | ".join(type_parts)
+    # Pushed last so the model, and the models nested in it, are added before the
+    # models for the list items.
+    if dict_class_name:
+        dict_model: list[str] = []
+        stack.append((dict_model, None))
+        _push_dict_model(type_info, dict_class_name, dict_model, stack)
 
 
-def generate_dict_model(type_info: TypeInfo, model_name: str, models: list[str]) -> str:
-    """Generate a BaseModel class for dictionary data."""
-    lines = [f"class {to_pascal_case(model_name)}(BaseModel):"]
-    lines.append('    model_config = ConfigDict(extra="forbid")')
+def _push_dict_model(
+    type_info: TypeInfo,
+    model_name: str,
+    out: list[str],
+    stack: list[_CodeItem],
+) -> None:
+    """Append the start of a BaseModel class to out, queueing its fields."""
+    out += (
+        f"class {to_pascal_case(model_name)}(BaseModel):",
+        '\n    model_config = ConfigDict(extra="forbid")',
+    )
 
+    # Fields without nested types are written straight away, until the first field
+    # that is queued. After it, they are collected into parts so they are queued in
+    # between the fields with nested types as a single str.
+    items: list[_CodeItem] = []
+    parts = out
     for field_name, field_wrapper in type_info.dict_keys.items():
-        field_type = build_type_annotation(field_wrapper, models)
+        snake_name = to_snake_case(field_name)
+        # Leading underscores never take part in the snake_case conversion, so they can
+        # be stripped from the converted name instead of converting the name again.
+        clean_name = snake_name.lstrip("_")
+        parts.append(f"\n    {clean_name}: ")
+        if _has_nested_parts(field_wrapper):
+            if parts is not out:
+                items.append((out, "".join(parts)))
+            items.append((out, field_wrapper))
+            parts = []
+        else:
+            _push_annotation(field_wrapper, parts, stack)
+        if snake_name != field_name or field_name.startswith("__"):
+            parts.append(f' = Field(alias="{field_name}")')
+    if parts is not out and parts:
+        items.append((out, "".join(parts)))
+
+    # Reversed so fields are popped, and written, in their original order.
+    stack.extend(reversed(items))
 
-        field_config = ""
-        if to_snake_case(field_name) != field_name or field_name.startswith("__"):
-            field_config = f' = Field(alias="{field_name}")'
 
-        clean_name = field_name.lstrip("_")
-        lines.append(f"    {to_snake_case(clean_name)}: {field_type}{field_config}")
-
-    return "\n".join(lines)
+def generate_dict_model(type_info: TypeInfo, model_name: str, models: list[str]) -> str:
+    """Generate a BaseModel class for dictionary data."""
+    out: list[str] = []
+    stack: list[_CodeItem] = []
+    _push_dict_model(type_info, model_name, out, stack)
+    _write_code(stack, models)
+    return "".join(out)
 
 
 def generate_pydantic_schema(type_info: TypeInfo, class_name: str) -> str:
@@ -217,22 +535,226 @@ def get_schema_from_strings(
     return generate_pydantic_schema(root, root_name)
 
 
+def _read_file(file_path: str | Path) -> bytes | mmap.mmap:
+    """Read a file, memory mapping it if it is large."""
+    with Path(file_path).open("rb") as file:
+        if (
+            _buffer_loads is not None
+            and os.fstat(file.fileno()).st_size > _MMAP_THRESHOLD
+        ):
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return file.read()
+
+
+def _load_json(raw_data: bytes | mmap.mmap) -> Any:  # noqa: ANN401
+    """Load JSON returned by _read_file, closing it if it is memory mapped.
+
+    msgspec rejects some input the json module accepts (ex. NaN and Infinity), that
+    input is loaded again with the json module so the result does not depend on which
+    loader is installed.
+    """
+    if isinstance(raw_data, bytes):
+        try:
+            return _json_loads(raw_data)
+        except ValueError:
+            if _json_loads is json.loads:
+                raise
+            return json.loads(raw_data)
+
+    with raw_data:
+        # Files are only memory mapped when there is a loader that can read them.
+        if _buffer_loads is None:
+            return json.loads(raw_data[:])
+        with memoryview(raw_data) as view:
+            try:
+                return _buffer_loads(view)
+            except ValueError:
+                return json.loads(bytes(view))
+
+
+def _cache_dir() -> Path:
+    """Get the directory, owned by the current user, that TypeInfos are cached in."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+    return (Path(base) if base else Path.home() / ".cache") / "devious-schema"
+
+
+def _cache_path(path: Path) -> Path:
+    """Get the path the TypeInfo for a resolved input path is cached at."""
+    digest = hashlib.sha256(str(path).encode()).hexdigest()
+    return _cache_dir() / f"{digest}.pkl"
+
+
+def _load_cached_typeinfo(path: Path, cache_key: _CacheKey) -> TypeInfo | None:
+    """Load the cached TypeInfo for a file if it was created from the same file."""
+    # The cache is only an optimization, anything wrong with it is treated as a miss.
+    try:
+        # The cache directory belongs to the current user rather than being next to the
+        # input files, so the pickles are as trusted as the user's own files.
+        cached_key, type_info = pickle.loads(  # noqa: S301
+            _cache_path(path).read_bytes(),
+        )
+    except (
+        OSError,
+        EOFError,
+        AttributeError,
+        ImportError,
+        TypeError,
+        ValueError,
+        pickle.UnpicklingError,
+    ):
+        return None
+
+    if cached_key != cache_key or not isinstance(type_info, TypeInfo):
+        return None
+    return type_info
+
+
+def _write_cached_typeinfo(
+    path: Path,
+    cache_key: _CacheKey,
+    type_info: TypeInfo,
+) -> None:
+    """Cache the TypeInfo for a file, replacing any older cache of it."""
+    data = pickle.dumps((cache_key, type_info))
+    cache_path = _cache_path(path)
+    cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    # Written to a temporary file first so another run never reads a partial cache.
+    fd, temp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(data)
+        Path(temp_path).replace(cache_path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+def _parse_file(file_path: str | Path, root_name: str) -> TypeInfo:
+    """Parse a JSON file into a new TypeInfo."""
+    type_info = TypeInfo(name=root_name)
+    parse(_load_json(_read_file(file_path)), type_info)
+    return type_info
+
+
+def _parse_file_cached(file_path: str | Path, root_name: str) -> TypeInfo:
+    """Parse a JSON file into a new TypeInfo, reusing the cache if it is unchanged."""
+    path = Path(file_path).resolve()
+    stat = path.stat()
+    cache_key = (_CACHE_VERSION, str(path), stat.st_mtime_ns, stat.st_size, root_name)
+    type_info = _load_cached_typeinfo(path, cache_key)
+    if type_info is None:
+        type_info = _parse_file(path, root_name)
+        # The cache is only an optimization, failing to write it is not an error.
+        with contextlib.suppress(OSError, RecursionError):
+            _write_cached_typeinfo(path, cache_key, type_info)
+    return type_info
+
+
+def _map_ahead[T, R](
+    executor: Executor,
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    window: int,
+) -> Iterator[R]:
+    """Like Executor.map, but only submits up to window calls ahead of the results."""
+    pending: deque[Future[R]] = deque()
+    try:
+        for item in items:
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            pending.append(executor.submit(fn, item))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _parse_files(
+    file_paths: Sequence[str | Path],
+    root: TypeInfo,
+    *,
+    cache: bool = False,
+    parallel: bool = False,
+) -> None:
+    """Parse multiple JSON files into a TypeInfo.
+
+    Files are read on a thread pool so the IO overlaps, but parsing stays on the calling
+    thread because every file updates the same TypeInfo.
+
+    With cache enabled each file is parsed into its own TypeInfo which is saved in the
+    user's cache directory, unchanged files load that TypeInfo instead of being parsed
+    again.
+
+    With parallel enabled each file is parsed into its own TypeInfo on a process pool so
+    parsing is not limited by the GIL.
+
+    TypeInfos parsed from individual files are merged into the root in the same order
+    as the files.
+    """
+    if not file_paths:
+        return
+
+    executor: Executor
+    chunksize = 1
+    if parallel:
+        max_workers = min(os.process_cpu_count() or 1, len(file_paths))
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        # Send files in batches so many small files are not dominated by the overhead
+        # of talking to the worker processes.
+        chunksize = max(1, len(file_paths) // (max_workers * 4))
+    else:
+        executor = ThreadPoolExecutor(
+            max_workers=min(_MAX_READ_WORKERS, len(file_paths)),
+        )
+
+    with executor:
+        if cache or parallel:
+            parse_file = functools.partial(
+                _parse_file_cached if cache else _parse_file,
+                root_name=root.name,
+            )
+            for type_info in executor.map(parse_file, file_paths, chunksize=chunksize):
+                merge_typeinfo(root, type_info)
+        else:
+            for raw_data in _map_ahead(
+                executor,
+                _read_file,
+                file_paths,
+                _MAX_READ_AHEAD,
+            ):
+                parse(_load_json(raw_data), root)
+
+
+def _find_json_files(folder_path: str | Path) -> list[str]:
+    """Find the JSON files directly inside a folder."""
+    with os.scandir(folder_path) as entries:
+        return [
+            entry.path
+            for entry in entries
+            if entry.name.endswith(".json") and entry.is_file()
+        ]
+
+
 def get_schema_from_files(
     file_paths: list[str | Path] | list[str] | list[Path],
     root_name: str,
+    *,
+    cache: bool = False,
+    parallel: bool = False,
 ) -> str:
     """Generate Pydantic schema from multiple input files."""
     root = TypeInfo(name=root_name)
-    for file_path in file_paths:
-        path = Path(file_path)
-        parsed_data = json.loads(path.read_text(encoding="utf-8"))
-        parse(parsed_data, root)
+    _parse_files(file_paths, root, cache=cache, parallel=parallel)
     return generate_pydantic_schema(root, root_name)
 
 
 def get_schema_from_folder(
     folder_path: str | Path,
     root_name: str,
+    *,
+    cache: bool = False,
+    parallel: bool = False,
 ) -> str:
     """Generate Pydantic schema from all JSON files in a folder."""
     root = TypeInfo(name=root_name)
@@ -241,10 +763,7 @@ def get_schema_from_folder(
         msg = f"Error: '{folder_path}' does not exist or is not a directory"
         raise FileNotFoundError(msg)
 
-    for json_file in path.glob("*.json"):
-        parsed_data = json.loads(json_file.read_text(encoding="utf-8"))
-        parse(parsed_data, root)
-
+    _parse_files(_find_json_files(path), root, cache=cache, parallel=parallel)
     return generate_pydantic_schema(root, root_name)
 
 
@@ -266,6 +785,14 @@ class CLISettings(BaseSettings):
     output: str = Field(
         description="Output file path (prints to stdout if not specified)",
     )
+    cache: bool = Field(
+        default=False,
+        description="Cache parsed files and only reparse files that changed",
+    )
+    parallel: bool = Field(
+        default=False,
+        description="Parse files in parallel on multiple processes",
+    )
 
     class Config:
         env_prefix = ""
@@ -283,7 +810,7 @@ def main() -> None:
         if not folder_path.exists() or not folder_path.is_dir():
             msg = f"Error: '{settings.folder}' does not exist or is not a directory"
             raise FileNotFoundError(msg)
-        file_paths.extend(folder_path.glob("*.json"))
+        file_paths.extend(map(Path, _find_json_files(folder_path)))
 
     if settings.files:
         for file_str in settings.files:
@@ -297,7 +824,12 @@ def main() -> None:
         msg = "Error: No valid input files provided. Use --files or --folder."
         raise FileNotFoundError(msg)
 
-    schema = get_schema_from_files(file_paths, settings.root_name)
+    schema = get_schema_from_files(
+        file_paths,
+        settings.root_name,
+        cache=settings.cache,
+        parallel=settings.parallel,
+    )
     Path(settings.output).write_text(schema, encoding="utf-8")
 
 
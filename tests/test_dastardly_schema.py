@@ -1,8 +1,18 @@
+import json
+import pickle
+from pathlib import Path
 from typing import Any
 
+import pytest
+
+import devious_schema
 from devious_schema import (
+    TypeInfo,
     get_schema,
+    get_schema_from_files,
+    get_schema_from_folder,
     get_schema_from_strings,
+    parse,
     to_pascal_case,
     to_snake_case,
 )
@@ -107,6 +117,56 @@ class Root(BaseModel):
     assert expected == get_schema_from_strings(params, "Root")
 
 
+def test_combined_optional_keys() -> None:
+    params: list[dict[str, Any]] = [{"a": "b"}, {"b": 123}]
+    expected = """from pydantic import BaseModel, Field, ConfigDict
+from typing import Any
+
+
+class Root(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    a: str | None
+    b: int | None"""
+    assert expected == get_schema_from_strings(params, "Root")
+
+
+def test_repeated_list_item_shapes() -> None:
+    data: list[Any] = [{"a": 1}, {"a": 1, "b": "c"}, {"a": 1}, {"a": "d"}]
+    expected = """from pydantic import BaseModel, Field, ConfigDict
+from typing import Any
+
+
+class RootItemDict(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    a: str | int
+    b: str | None
+
+
+root: list["RootItemDict"]"""
+    assert expected == get_schema(data, "Root")
+
+
+def test_repeated_list_item_shapes_nested() -> None:
+    data: list[Any] = [{"a": {"x": 1}}, {"a": {"y": "s"}}]
+    expected = """from pydantic import BaseModel, Field, ConfigDict
+from typing import Any
+
+
+class RootItemDict(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    a: "RootItemADict"
+
+
+class RootItemADict(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    x: int | None
+    y: str | None
+
+
+root: list["RootItemDict"]"""
+    assert expected == get_schema(data, "Root")
+
+
 def test_combined_list_schema() -> None:
     params: list[Any] = [["asd"], [123]]
     expected = """from pydantic import BaseModel, Field, ConfigDict
@@ -130,3 +190,225 @@ class RootDict(BaseModel):
 
 root: "RootDict" | list[str | int]"""
     assert expected == get_schema_from_strings(params, "Root")
+
+
+def test_combined_empty_root_dict() -> None:
+    params: list[Any] = [[1], {}]
+    expected = """from pydantic import BaseModel, Field, ConfigDict
+from typing import Any
+
+
+root: dict[str, Any] | list[int]"""
+    assert expected == get_schema_from_strings(params, "Root")
+
+
+def test_unexpected_type() -> None:
+    data: dict[str, Any] = {"a": {1, 2, 3}}
+    with pytest.raises(TypeError, match="Unexpected value type"):
+        get_schema(data, "Root")
+
+
+def test_parse_deeply_nested() -> None:
+    depth = 5000
+    data: dict[str, Any] = {}
+    current = data
+    for _ in range(depth):
+        current["a"] = {}
+        current = current["a"]
+
+    type_info = parse(data, TypeInfo(name="Root"))
+    for _ in range(depth):
+        type_info = type_info.dict_keys["a"]
+    assert not type_info.dict_keys
+
+
+def test_schema_deeply_nested() -> None:
+    depth = 3000
+    data: dict[str, Any] = {}
+    current = data
+    for _ in range(depth):
+        current["a"] = [{}]
+        current = current["a"][0]
+    current["b"] = [[1]]
+
+    schema = get_schema(data, "Root")
+    assert schema.count('    a: list["AItemDict"]') == depth
+    assert "    b: list[list[int]]" in schema
+
+
+def test_schema_from_files(tmp_path: Path) -> None:
+    params: list[dict[str, Any]] = [{"a": "b"}, {"a": 123}]
+    file_paths: list[Path] = []
+    for i, param in enumerate(params):
+        file_path = tmp_path / f"{i}.json"
+        file_path.write_text(json.dumps(param), encoding="utf-8")
+        file_paths.append(file_path)
+    (tmp_path / "ignored.txt").write_text("not json", encoding="utf-8")
+
+    expected = get_schema_from_strings(params, "Root")
+    assert expected == get_schema_from_files(file_paths, "Root")
+    assert expected == get_schema_from_folder(tmp_path, "Root")
+    assert expected == get_schema_from_files(file_paths, "Root", parallel=True)
+
+
+def test_schema_from_files_merged(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    params: list[Any] = [{"a": {"x": 1}}, {"a": {"y": 2}, "b": 1}, [{"c": 1}]]
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    file_paths: list[Path] = []
+    for i, param in enumerate(params):
+        file_path = input_dir / f"{i}.json"
+        file_path.write_text(json.dumps(param), encoding="utf-8")
+        file_paths.append(file_path)
+
+    expected = get_schema_from_strings(params, "Root")
+    assert expected == get_schema_from_files(file_paths, "Root", parallel=True)
+    assert expected == get_schema_from_files(file_paths, "Root", cache=True)
+    assert expected == get_schema_from_files(file_paths, "Root", cache=True)
+
+
+def test_schema_from_files_read_ahead(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    read_ahead = 2
+    monkeypatch.setattr(devious_schema, "_MAX_READ_AHEAD", read_ahead)
+    params: list[dict[str, Any]] = [{f"key_{i}": i} for i in range(10)]
+    file_paths: list[Path] = []
+    for i, param in enumerate(params):
+        file_path = tmp_path / f"{i}.json"
+        file_path.write_text(json.dumps(param), encoding="utf-8")
+        file_paths.append(file_path)
+    expected = get_schema_from_strings(params, "Root")
+
+    read_paths: list[str | Path] = []
+    parsed_count = 0
+    read_file = devious_schema._read_file  # noqa: SLF001
+    parse_file = devious_schema.parse
+
+    def counting_read_file(file_path: str | Path) -> Any:  # noqa: ANN401
+        read_paths.append(file_path)
+        return read_file(file_path)
+
+    def counting_parse(
+        input_data: dict[str, Any] | list[Any],
+        type_info: TypeInfo,
+    ) -> TypeInfo:
+        nonlocal parsed_count
+        # Files still being read or waiting to be parsed are bounded by the read ahead.
+        assert len(read_paths) <= parsed_count + read_ahead
+        parsed_count += 1
+        return parse_file(input_data, type_info)
+
+    monkeypatch.setattr(devious_schema, "_read_file", counting_read_file)
+    monkeypatch.setattr(devious_schema, "parse", counting_parse)
+    assert expected == get_schema_from_files(file_paths, "Root")
+    assert parsed_count == len(params)
+
+
+def test_schema_from_files_cache(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_dir))
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    file_path = input_dir / "0.json"
+    file_path.write_text(json.dumps({"a": "b"}), encoding="utf-8")
+    expected = get_schema_from_strings([{"a": "b"}], "Root")
+    assert expected == get_schema_from_folder(input_dir, "Root", cache=True)
+    assert [file_path] == list(input_dir.iterdir())
+    assert len(list((cache_dir / "devious-schema").iterdir())) == 1
+
+    parse_file = devious_schema._parse_file  # noqa: SLF001
+    parsed_paths: list[str | Path] = []
+
+    def counting_parse_file(file_path: str | Path, root_name: str) -> TypeInfo:
+        parsed_paths.append(file_path)
+        return parse_file(file_path, root_name)
+
+    monkeypatch.setattr(devious_schema, "_parse_file", counting_parse_file)
+    assert expected == get_schema_from_folder(input_dir, "Root", cache=True)
+    assert parsed_paths == []
+
+    file_path.write_text(json.dumps({"a": 123, "c": None}), encoding="utf-8")
+    expected = get_schema_from_strings([{"a": 123, "c": None}], "Root")
+    assert expected == get_schema_from_folder(input_dir, "Root", cache=True)
+    assert parsed_paths == [file_path.resolve()]
+
+
+@pytest.mark.parametrize(
+    "cache_data",
+    [b"", b"not a pickle", pickle.dumps(5), b"cmissing_module_name\nname\n."],
+)
+def test_schema_from_files_bad_cache(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    cache_data: bytes,
+) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    file_path = tmp_path / "0.json"
+    file_path.write_text(json.dumps({"a": "b"}), encoding="utf-8")
+    cache_path = devious_schema._cache_path(file_path.resolve())  # noqa: SLF001
+    cache_path.parent.mkdir(parents=True)
+    cache_path.write_bytes(cache_data)
+
+    expected = get_schema_from_strings([{"a": "b"}], "Root")
+    assert expected == get_schema_from_files([file_path], "Root", cache=True)
+
+
+def test_schema_from_files_big_int(tmp_path: Path) -> None:
+    file_path = tmp_path / "0.json"
+    file_path.write_text('{"a": 123456789012345678901234567890}', encoding="utf-8")
+    expected = get_schema_from_strings([{"a": 123456789012345678901234567890}], "Root")
+    assert expected == get_schema_from_files([file_path], "Root")
+
+
+def test_schema_from_files_nan(tmp_path: Path) -> None:
+    file_path = tmp_path / "0.json"
+    file_path.write_text('{"a": NaN, "b": Infinity, "c": 1}', encoding="utf-8")
+    expected = get_schema_from_strings(
+        [{"a": float("nan"), "b": float("inf"), "c": 1}],
+        "Root",
+    )
+    assert expected == get_schema_from_files([file_path], "Root")
+
+
+def test_schema_from_large_files(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Treat every file as large so they are memory mapped when the loader supports it.
+    monkeypatch.setattr(devious_schema, "_MMAP_THRESHOLD", 0)
+    file_path = tmp_path / "0.json"
+    file_path.write_text(json.dumps({"a": [1, {"b": "c"}]}), encoding="utf-8")
+    expected = get_schema_from_strings([{"a": [1, {"b": "c"}]}], "Root")
+    assert expected == get_schema_from_files([file_path], "Root")
+
+
+def test_schema_from_files_msgspec(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    msgspec_json = pytest.importorskip("msgspec.json")
+    monkeypatch.setattr(devious_schema, "_json_loads", msgspec_json.decode)
+    monkeypatch.setattr(devious_schema, "_buffer_loads", msgspec_json.decode)
+    monkeypatch.setattr(devious_schema, "_MMAP_THRESHOLD", 0)
+    file_path = tmp_path / "0.json"
+    file_path.write_text(
+        '{"a": 123456789012345678901234567890, "b": [1, {"c": "d"}]}',
+        encoding="utf-8",
+    )
+    nan_file_path = tmp_path / "1.json"
+    nan_file_path.write_text('{"a": NaN}', encoding="utf-8")
+
+    expected = get_schema_from_strings(
+        [{"a": 123456789012345678901234567890, "b": [1, {"c": "d"}]}, {"a": 1.5}],
+        "Root",
+    )
+    assert expected == get_schema_from_files([file_path, nan_file_path], "Root")